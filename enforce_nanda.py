@@ -7,20 +7,26 @@ Author : Krishnendu Dasgupta
 import asyncio            # Async IO for concurrency
 import json               # Parse and serialize JSON
 import os                 # Environment variables and filesystem operations
+import logging            # Leveled console output for connection diagnostics
+import re                 # Parse grouped answers from batched prompts
 from typing import Optional  # Type hint for optional values
 from contextlib import AsyncExitStack  # Manage multiple async context managers
-import sys                 # Access command-line arguments
+import argparse            # Parse command-line arguments
+import sys                 # Console streams for input and log output
+import threading           # Background stdin reader that never blocks shutdown
 
 # --- Third-Party Imports ---
 from mcp import ClientSession           # MCP client session for tool communication
 from mcp.client.sse import sse_client   # SSE client for streaming MCP events
-from anthropic import Anthropic         # Anthropic Claude LLM client
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient  # Anthropic Claude LLM client
+import httpx                            # Connection limits for the pooled LLM transport
 from dotenv import load_dotenv          # Load .env configurations
+import orjson                           # Fast JSON serialization for tool arguments
 import requests                         # HTTP requests for registry discovery
 
 # Local policy engine import
 # from policy import get_verifiable_mcp_endpoint
-from nandaPolicy import PolicyManager   # Implements NCP policy logic
+from nandaPolicy import PolicyManager, log_banner   # Implements NCP policy logic
 
 # Load environment variables from a .env file into os.environ
 load_dotenv()
@@ -28,11 +34,142 @@ load_dotenv()
 # Global flag indicating whether policy enforcement is active
 POLICY_ENFORCEMENT = os.getenv("POLICY_ENFORCEMENT_STATUS")
 
+# Console log level (e.g. DEBUG shows the raw registry response)
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Module logger; configured in main()
+logger = logging.getLogger(__name__)
+
+# Claude model and response budget shared by interactive and batch calls
+MODEL = "claude-3-5-sonnet-20241022"
+MAX_TOKENS = 1000
+
+# Exponential backoff bounds (seconds) while polling a message batch
+BATCH_POLL_INITIAL_DELAY = 1.0
+BATCH_POLL_MAX_DELAY = 60.0
+
+# Queries typed within this window (seconds) are answered with one LLM call
+CHAT_BATCH_WINDOW = 0.25
+CHAT_BATCH_MAX = 8
+
+# Request headers for the SSE stream so proxies keep it open and unbuffered
+SSE_HEADERS = {
+    "Accept": "text/event-stream",
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+}
+
+# Seconds between MCP pings while the chat is idle
+SSE_KEEPALIVE_INTERVAL = 30.0
+
+# Words that end the interactive conversation
+EXIT_WORDS = ['bye', 'good bye', 'goodbye', 'bye bye', 'byebye']
+
+# Prompt used when several pending queries are answered in a single call
+GROUPED_PROMPT_TEMPLATE = (
+    "Answer each of the following {count} questions independently.\n"
+    "Reply with exactly one <answer>...</answer> element per question, in the "
+    "same order, wrapped in <answers></answers>, and nothing else.\n\n"
+    "{questions}"
+)
+_ANSWERS_RE = re.compile(r"<answers>(.*?)</answers>", re.S)
+_ANSWER_RE = re.compile(r"<answer>(.*?)</answer>", re.S)
+
+# Marker separating a recipe's header from its instructions, and its leading title
+_RECIPE_SPLIT = "Instructions:"
+_TITLE_RE = re.compile(r"^\s*Title:")
+
+# Stable system prompt; kept constant so Anthropic can serve it from the prompt cache
+SYSTEM_PROMPT = (
+    "You are the Nutrition and Recipe Assistant for the KNOW YOUR FOOD Hub. "
+    "Answer questions about food, nutrition facts and recipes. When tools are "
+    "available, prefer them over trained knowledge so answers come from a "
+    "verifiable source."
+)
+SYSTEM_BLOCKS = [
+    {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+]
+
+
+def _configure_logging():
+    """
+    Send this app's log output to stdout, next to the chat, at LOG_LEVEL.
+    The root logger stays at WARNING so third-party INFO chatter (httpx
+    request lines, MCP SSE connection messages) is kept off the console.
+    """
+    level = logging.getLevelName(LOG_LEVEL)
+    if not isinstance(level, int):
+        raise SystemExit(
+            f"Invalid LOG_LEVEL {LOG_LEVEL!r}; use one of DEBUG, INFO, WARNING, ERROR, CRITICAL."
+        )
+    logging.basicConfig(level=logging.WARNING, format="%(message)s", stream=sys.stdout)
+    for name in (__name__, "nandaPolicy"):
+        logging.getLogger(name).setLevel(level)
+
+
+def _load_batch_queries(path: str) -> list[str]:
+    """
+    Read queries from a JSONL file. Each line is either a JSON string or
+    an object with a "query" field; blank lines are ignored.
+
+    :param path: Path to the JSONL file.
+    :return: Queries in file order.
+    """
+    queries = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            queries.append(entry if isinstance(entry, str) else entry["query"])
+    return queries
+
+
+def _format_recipe(tool_output: str) -> str:
+    """
+    Render get_recipe output as a markdown heading plus an Instructions section.
+    Output without an Instructions marker is returned unchanged.
+
+    :param tool_output: Raw text returned by the get_recipe tool.
+    :return: Formatted recipe text.
+    """
+    head, sep, body = tool_output.partition(_RECIPE_SPLIT)
+    if not sep:
+        return head
+    header = _TITLE_RE.sub("\n# ", head, count=1).strip()
+    return f"{header}\n\n## Instructions:\n{body.strip()}"
+
+
+def _tool_output_text(raw) -> str:
+    """
+    Normalize MCP tool result content to a single string.
+
+    :param raw: CallToolResult.content (list of parts, string or object).
+    :return: Plain text output.
+    """
+    if isinstance(raw, list):
+        return "\n".join(getattr(part, "text", str(part)) for part in raw)
+    if isinstance(raw, str):
+        return raw
+    if hasattr(raw, "text"):
+        return raw.text
+    return str(raw)
+
+
+def _stable_json(value):
+    """
+    Return a copy of a JSON-like value with dict keys sorted recursively,
+    so the serialized tool schema is byte-identical across requests.
+    """
+    return json.loads(json.dumps(value, sort_keys=True))
+
 
 class MCPClient:
     """
     Main MCP client orchestrating policy enforcement, SSE connection,
-    and LLM-based tool invocation. Preserves print statements for clarity.
+    and LLM-based tool invocation. Startup and connection messages are logged;
+    the interactive chat itself is printed.
     """
 
     def __init__(self):
@@ -40,14 +177,24 @@ class MCPClient:
         Initialize internal state:
         - session: optional MCP ClientSession
         - exit_stack: manages async contexts
-        - anthropic: Claude LLM client
+        - anthropic: async Claude LLM client over a pooled HTTP/2 transport
+        - policy: PolicyManager used for endpoint resolution
         - session/streams contexts for cleanup
+        - _available_tools: tool schemas cached once per session
         """
         self.session: Optional[ClientSession] = None
+        self._available_tools: list[dict] = []
+        self.policy: Optional[PolicyManager] = None
         self.exit_stack = AsyncExitStack()
-        self.anthropic = Anthropic()
+        self.anthropic = AsyncAnthropic(
+            http_client=DefaultAsyncHttpxClient(
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+            )
+        )
         self._session_context = None
         self._streams_context = None
+        self._keepalive_task: Optional[asyncio.Task] = None
 
     async def connect_to_sse_server(self, server_url: Optional[str]):
         """
@@ -57,69 +204,111 @@ class MCPClient:
         1. Enforce NCP policy to discover a valid endpoint.
         2. Append '/sse' to endpoint and validate scheme.
         3. Open SSE stream and initialize MCP ClientSession.
-        4. List available tools and print them.
+        4. List available tools, cache them for the session and print them.
         """
         # 1. Fetch via policy
-        policy = PolicyManager()
-        endpoint = policy.get_verifiable_mcp_endpoint()
+        self.policy = PolicyManager(discover=False)
+        endpoint = await self.policy.aget_verifiable_mcp_endpoint()
         # endpoint = get_verifiable_mcp_endpoint()  # legacy option
 
         if endpoint:
             # Construct SSE-endpoint URL
             server_url = endpoint.rstrip("/") + "/sse"
-            print("  -----------------------------------------------------------------------------------------------------------")
-            print("  Policies are enforced. Tools are fetched as per Policy. Response is curated as per verifiable trust source. Machine Intelligence will assist post veriable information is retrieved.")
-            print("  -----------------------------------------------------------------------------------------------------------")
-            print("  ====================TRUST VERIFICATION PROCESS ENDED AS PER POLICY==========================")
+            log_banner(logger,
+                       "  -----------------------------------------------------------------------------------------------------------",
+                       "  Policies are enforced. Tools are fetched as per Policy. Response is curated as per verifiable trust source. Machine Intelligence will assist post veriable information is retrieved.",
+                       "  -----------------------------------------------------------------------------------------------------------",
+                       "  ====================TRUST VERIFICATION PROCESS ENDED AS PER POLICY==========================")
         else:
             # No valid endpoint; skip SSE
-            print("  -----------------------------------------------------------------------------------------------------------")
-            print("  Policies are enforced. Tools cannot be fetched as per Policy. The response is on trained data and previous learnings on the Machine Intelligence.")
-            print("  -----------------------------------------------------------------------------------------------------------")
-            print("  ====================TRUST VERIFICATION PROCESS ENDED AS PER POLICY==========================")
+            log_banner(logger,
+                       "  -----------------------------------------------------------------------------------------------------------",
+                       "  Policies are enforced. Tools cannot be fetched as per Policy. The response is on trained data and previous learnings on the Machine Intelligence.",
+                       "  -----------------------------------------------------------------------------------------------------------",
+                       "  ====================TRUST VERIFICATION PROCESS ENDED AS PER POLICY==========================")
             return
 
         # 2. Ensure it's a valid HTTP/HTTPS URL
         if not server_url.lower().startswith(("http://", "https://")):
-            print(f"Invalid MCP URL: {server_url!r}. Skipping tool connection.")
+            logger.warning("Invalid MCP URL: %r. Skipping tool connection.", server_url)
             return
 
         # 3. Now connect via SSE
         try:
-            self._streams_context = sse_client(url=server_url)
+            self._streams_context = sse_client(url=server_url, headers=SSE_HEADERS)
             streams = await self._streams_context.__aenter__()
             self._session_context = ClientSession(*streams)
             self.session = await self._session_context.__aenter__()
             await self.session.initialize()
 
-            # List and print available tools
-            resp = await self.session.list_tools()
-            tools = [t.name for t in resp.tools]
-            print("")
-            print("  ===========================CONNECTION ESTABLISHED======================================")
-            print("")
-            print(f"  Established Connection with MCP Server. Tools available: {tools}")
-            print("")
-            print("  ===========================[------------------]======================================")
-            print("")
+            # Fetch tools once for the session and print them
+            await self.refresh_tools()
+
+            # Keep the stream alive with periodic pings while the user is idle
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+            log_banner(logger,
+                       "",
+                       "  ===========================CONNECTION ESTABLISHED======================================",
+                       "")
+            logger.info("  Established Connection with MCP Server. Tools available: %s",
+                        [t["name"] for t in self._available_tools])
+            log_banner(logger,
+                       "",
+                       "  ===========================[------------------]======================================",
+                       "")
 
         except Exception as e:
             # Handle connection errors and cleanup
-            print(f"Failed to connect to MCP server at {server_url}: {e}")
+            logger.error("Failed to connect to MCP server at %s: %s", server_url, e)
             if self._session_context:
                 await self._session_context.__aexit__(None, None, None)
             if self._streams_context:
                 await self._streams_context.__aexit__(None, None, None)
             self.session = None
 
+    async def refresh_tools(self):
+        """
+        Re-fetch the tool list from the MCP server and cache it in the
+        shape expected by the Anthropic messages API. Tools are sorted and
+        their schemas key-sorted so the prefix is stable, and the last tool
+        carries a cache_control marker to enable prompt caching.
+        """
+        resp = await self.session.list_tools()
+        tools = [
+            {"name": t.name, "description": t.description, "input_schema": _stable_json(t.inputSchema)}
+            for t in sorted(resp.tools, key=lambda t: t.name)
+        ]
+        if tools:
+            tools[-1]["cache_control"] = {"type": "ephemeral"}
+        self._available_tools = tools
+
+    async def _keepalive(self):
+        """
+        Ping the MCP server every SSE_KEEPALIVE_INTERVAL seconds.
+        Runs as its own task and ticks with plain sleeps, so idle periods
+        never raise and discard timeout exceptions.
+        """
+        while True:
+            await asyncio.sleep(SSE_KEEPALIVE_INTERVAL)
+            try:
+                await self.session.send_ping()
+            except Exception as e:
+                logger.debug("MCP keepalive ping failed: %s", e)
+
     async def cleanup(self):
         """
         Gracefully exit all async contexts to close SSE and client sessions.
         """
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+            await asyncio.gather(self._keepalive_task, return_exceptions=True)
         if self._session_context:
             await self._session_context.__aexit__(None, None, None)
         if self._streams_context:
             await self._streams_context.__aexit__(None, None, None)
+        if self.policy:
+            await self.policy.aclose()
+        await self.anthropic.close()
 
     async def process_query(self, query: str) -> str:
         """
@@ -133,87 +322,256 @@ class MCPClient:
 
         # Fallback: use only LLM if no session
         if not self.session:
-            resp = self.anthropic.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=1000,
+            resp = await self.anthropic.messages.create(
+                model=MODEL,
+                max_tokens=MAX_TOKENS,
+                system=SYSTEM_BLOCKS,
                 messages=messages,
             )
             return resp.content[0].text
 
-        # 1. Fetch list of tools
-        list_resp = await self.session.list_tools()
-        available_tools = [
-            {"name": t.name, "description": t.description, "input_schema": t.inputSchema}
-            for t in list_resp.tools
-        ]
+        # 1. Reuse tools cached when the session was established
+        available_tools = self._available_tools
 
         # 2. Ask LLM which tool to use
-        llm_resp = self.anthropic.messages.create(
-            model="claude-3-5-sonnet-20241022",
-            max_tokens=1000,
+        llm_resp = await self.anthropic.messages.create(
+            model=MODEL,
+            max_tokens=MAX_TOKENS,
+            system=SYSTEM_BLOCKS,
             messages=messages,
             tools=available_tools
         )
+        return await self._complete_tool_turn(messages, llm_resp)
+
+    async def _complete_tool_turn(self, messages: list[dict], llm_resp) -> str:
+        """
+        Run the tools requested in an LLM reply and, if the reply is waiting
+        on them, send one follow-up call with every tool result.
 
+        :param messages: Conversation so far, ending with the user query.
+        :param llm_resp: LLM Message answering that conversation.
+        :return: Tool-augmented response text.
+        """
+        available_tools = self._available_tools
         final_text = []
+        tool_results = []
+
+        # 3. Run every requested tool concurrently; MCP tools are independent
+        tool_calls = [c for c in llm_resp.content if c.type == 'tool_use']
+        results = await asyncio.gather(
+            *(self.session.call_tool(c.name, c.input) for c in tool_calls)
+        )
+        outputs = {c.id: _tool_output_text(r.content) for c, r in zip(tool_calls, results)}
 
-        # 3. Iterate LLM content chunks
+        # Iterate LLM content chunks in order to build the reply
         for content in llm_resp.content:
             if content.type == 'text':
                 # Plain text reply
                 final_text.append(str(content.text))
             elif content.type == 'tool_use':
-                # LLM decided to invoke a tool
+                # LLM invoked a tool; its output is already available
                 tool_name = content.name
                 tool_args = content.input
 
                 # Log and append invocation message
-                printable_args = json.dumps(tool_args) if not isinstance(tool_args, str) else tool_args
+                printable_args = tool_args if isinstance(tool_args, str) else orjson.dumps(tool_args).decode()
                 final_text.append(f"[Calling tool {tool_name} with args {printable_args}]")
 
-                # Invoke the tool
-                result = await self.session.call_tool(tool_name, tool_args)
-                raw = result.content
-
-                # Normalize output to string
-                if isinstance(raw, list):
-                    texts = [getattr(part, "text", str(part)) for part in raw]
-                    tool_output = "\n".join(texts)
-                elif isinstance(raw, str):
-                    tool_output = raw
-                elif hasattr(raw, "text"):
-                    tool_output = raw.text
-                else:
-                    tool_output = str(raw)
+                tool_output = outputs[content.id]
 
                 # Special post-processing for recipes
                 if tool_name == "get_recipe":
-                    parts = tool_output.split("Instructions:")
-                    header = parts[0].replace("Title:", "\n# ").strip()
-                    body = parts[1] if len(parts) > 1 else ""
-                    recipe_text = header + "\n\n## Instructions:\n" + body.strip()
-                    final_text.append(recipe_text)
+                    final_text.append(_format_recipe(tool_output))
                 else:
                     final_text.append(tool_output)
 
-                # 4. Feed tool output back into LLM conversation
-                if getattr(content, "text", None):
-                    messages.append({"role": "assistant", "content": content.text})
-                messages.append({"role": "user", "content": tool_output})
-
-                # 5. Let LLM continue with updated history
-                llm_resp = self.anthropic.messages.create(
-                    model="claude-3-5-sonnet-20241022",
-                    max_tokens=1000,
-                    messages=messages,
+                tool_results.append(
+                    {"type": "tool_result", "tool_use_id": content.id, "content": tool_output}
                 )
-                final_text.append(llm_resp.content[0].text)
+
+        # 4. The answer is complete unless the LLM stopped to wait for tool results
+        if not tool_results or llm_resp.stop_reason != "tool_use":
+            return "\n".join(final_text)
+
+        # 5. Feed every tool result back in one turn and let the LLM wrap up
+        messages.append({"role": "assistant", "content": llm_resp.content})
+        messages.append({"role": "user", "content": tool_results})
+        llm_resp = await self.anthropic.messages.create(
+            model=MODEL,
+            max_tokens=MAX_TOKENS,
+            system=SYSTEM_BLOCKS,
+            messages=messages,
+            tools=available_tools
+        )
+        final_text.extend(b.text for b in llm_resp.content if b.type == "text")
 
         return "\n".join(final_text)
 
+    def _batch_params(self, query: str) -> dict:
+        """
+        Build Message Batches request params for a single query.
+
+        :param query: User-entered text.
+        :return: Params dict matching messages.create arguments.
+        """
+        params = {
+            "model": MODEL,
+            "max_tokens": MAX_TOKENS,
+            "system": SYSTEM_BLOCKS,
+            "messages": [{"role": "user", "content": query}],
+        }
+        if self.session and self._available_tools:
+            params["tools"] = self._available_tools
+        return params
+
+    async def process_queries_batch(self, queries: list[str]) -> list[str]:
+        """
+        Answer many queries through the Anthropic Message Batches API.
+        Meant for non-interactive runs: batches are cheaper but can take minutes.
+        Results that stop to request a tool are completed live from the batched
+        reply: only the tools and the wrap-up call run outside the batch.
+
+        :param queries: User queries.
+        :return: Responses in the same order as queries.
+        """
+        batch_requests = [
+            {"custom_id": str(i), "params": self._batch_params(q)}
+            for i, q in enumerate(queries)
+        ]
+        batch = await self.anthropic.messages.batches.create(requests=batch_requests)
+
+        # Poll with exponential backoff until the batch finishes
+        delay = BATCH_POLL_INITIAL_DELAY
+        while batch.processing_status != "ended":
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, BATCH_POLL_MAX_DELAY)
+            batch = await self.anthropic.messages.batches.retrieve(batch.id)
+
+        # Results may arrive in any order; place them by custom_id.
+        # Read the whole stream before doing any live work.
+        answers = [""] * len(queries)
+        pending_tools = {}
+        async for entry in await self.anthropic.messages.batches.results(batch.id):
+            idx = int(entry.custom_id)
+            if entry.result.type != "succeeded":
+                answers[idx] = f"Error: batch request {entry.result.type}"
+                continue
+            message = entry.result.message
+            if message.stop_reason == "tool_use" and self.session:
+                pending_tools[idx] = message
+            else:
+                answers[idx] = "\n".join(b.text for b in message.content if b.type == "text")
+
+        # Continue tool-using replies from where the batch left off
+        if pending_tools:
+            completed = await asyncio.gather(*(
+                self._complete_tool_turn([{"role": "user", "content": queries[idx]}], message)
+                for idx, message in pending_tools.items()
+            ))
+            for idx, answer in zip(pending_tools, completed):
+                answers[idx] = answer
+        return answers
+
+    async def run_batch_file(self, path: str):
+        """
+        Answer every query in a JSONL file via the batch path and print the results.
+
+        :param path: Path to the JSONL file of queries.
+        """
+        queries = _load_batch_queries(path)
+        if not queries:
+            print(f"  No queries found in {path}; nothing to submit.")
+            return
+        print(f"  Submitting {len(queries)} queries as a message batch…")
+        answers = await self.process_queries_batch(queries)
+        for query, answer in zip(queries, answers):
+            print(f"  \nQuery: {query}")
+            print('\n' + answer)
+
+    async def process_query_group(self, queries: list[str]) -> list[str]:
+        """
+        Answer several queries with a single LLM call and split the reply.
+        Only plain LLM answers are grouped: with MCP tools available most
+        queries need a tool, so each one goes through process_query instead.
+        Also falls back to process_query per item when the reply cannot be
+        split into one answer per query.
+
+        :param queries: Pending user queries.
+        :return: Responses in the same order as queries.
+        """
+        if len(queries) == 1 or (self.session and self._available_tools):
+            return [await self.process_query(q) for q in queries]
+
+        questions = "\n".join(
+            f"<question>{q}</question>" for q in queries
+        )
+        prompt = GROUPED_PROMPT_TEMPLATE.format(count=len(queries), questions=questions)
+        resp = await self.anthropic.messages.create(
+            model=MODEL,
+            max_tokens=MAX_TOKENS * len(queries),
+            system=SYSTEM_BLOCKS,
+            messages=[{"role": "user", "content": prompt}],
+        )
+
+        text = "".join(b.text for b in resp.content if b.type == "text")
+        block = _ANSWERS_RE.search(text)
+        answers = _ANSWER_RE.findall(block.group(1)) if block else []
+        if len(answers) == len(queries):
+            return [a.strip() for a in answers]
+
+        return [await self.process_query(q) for q in queries]
+
+    def _read_queries(self, queue: asyncio.Queue, loop: asyncio.AbstractEventLoop):
+        """
+        Read stdin lines on a daemon thread and hand them to the event loop.
+        The prompt is printed by chat_loop, so lines typed or pasted ahead
+        are buffered without showing a new prompt early. Being a daemon
+        thread, a blocked read never holds up shutdown on Ctrl-C.
+        Puts None once the user types an exit word or input is closed.
+        """
+        while True:
+            line = sys.stdin.readline()
+            query = line.strip() if line else EXIT_WORDS[0]
+            item = None if query.lower() in EXIT_WORDS else query
+            if item == "":
+                continue
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # Event loop already closed
+                return
+            if item is None:
+                return
+
+    async def _drain_pending(self, queue: asyncio.Queue, first: str) -> tuple[list[str], bool]:
+        """
+        Collect queries arriving within CHAT_BATCH_WINDOW of the first one.
+
+        :return: Tuple of (pending queries, whether the user asked to exit).
+        """
+        pending = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + CHAT_BATCH_WINDOW
+        while len(pending) < CHAT_BATCH_MAX:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            # asyncio.wait reports a timeout by returning, not by raising
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter}, timeout=remaining)
+            if not done:
+                getter.cancel()
+                break
+            item = getter.result()
+            if item is None:
+                return pending, True
+            pending.append(item)
+        return pending, False
+
     async def chat_loop(self):
         """
         Start interactive prompt. Users submit queries until typing 'bye'.
+        Queries that arrive close together are answered with one LLM call.
         """
         print('  Welcome to "KNOW YOUR FOOD Hub" ')
         print('  -------------------------------')
@@ -222,37 +580,64 @@ class MCPClient:
         print('  At any point type bye to exit.')
         print('  --------------------------------')
         print('  --------------CONVERSATION BEGINS-------------------')
-        while True:
-            query = input('  \nQuery: ').strip()
-            if query.lower() in ['bye', 'good bye', 'goodbye', 'bye bye', 'byebye']:
-                print('  Goodbye! Ending the conversation.')
-                print('')
-                print('  =================ALL CONNECTIONS CLOSED=============================')
-                print('\n')
+        queue: asyncio.Queue = asyncio.Queue()
+        threading.Thread(
+            target=self._read_queries, args=(queue, asyncio.get_running_loop()), daemon=True
+        ).start()
+        done = False
+        while not done:
+            # Prompt only once the previous answers have been printed
+            print('  \nQuery: ', end='', flush=True)
+            first = await queue.get()
+            if first is None:
                 break
+            pending, done = await self._drain_pending(queue, first)
             try:
-                resp = await self.process_query(query)
-                print('\n' + resp)
+                responses = await self.process_query_group(pending)
+                for query, resp in zip(pending, responses):
+                    # Label grouped answers so each can be matched to its question
+                    if len(pending) > 1:
+                        print(f"  \nQuery: {query}")
+                    print('\n' + resp)
             except Exception as e:
                 print(f"\nError: {e}")
+        print('  Goodbye! Ending the conversation.')
+        print('')
+        print('  =================ALL CONNECTIONS CLOSED=============================')
+        print('\n')
 
 
 async def main():
     """
     Entry point when script is run directly.
-    Performs trust verification then starts SSE and chat loop.
+    Performs trust verification then starts SSE and either the chat loop
+    or, with --batch-file, a one-shot batch run.
     """
-    server_url = sys.argv[1] if len(sys.argv) > 1 else None
+    parser = argparse.ArgumentParser(description="NCP policy-driven MCP client")
+    parser.add_argument("server_url", nargs="?", default=None,
+                        help="MCP server URL (overridden by policy discovery)")
+    parser.add_argument("--batch-file", metavar="QUERIES_JSONL",
+                        help="Answer queries from a JSONL file via the Message Batches API")
+    args = parser.parse_args()
+    _configure_logging()
+    server_url = args.server_url
     client = MCPClient()
     try:
-        print('')
-        print('  ====================TRUST VERIFICATION PROCESS INITIATED AS PER POLICY==========================')
-        print('  Policies are getting enforced. Kindly wait till we validate verifiable mcp servers as per your policy : ')
+        log_banner(logger,
+                   '',
+                   '  ====================TRUST VERIFICATION PROCESS INITIATED AS PER POLICY==========================',
+                   '  Policies are getting enforced. Kindly wait till we validate verifiable mcp servers as per your policy : ')
         await client.connect_to_sse_server(server_url)
-        await client.chat_loop()
+        if args.batch_file:
+            await client.run_batch_file(args.batch_file)
+        else:
+            await client.chat_loop()
     finally:
         await client.cleanup()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print('\n  Interrupted. Ending the conversation.')
@@ -4,14 +4,79 @@ Author : Krishnendu Dasgupta
 
 # --- Standard Library Imports ---
 import os               # Filesystem operations and environment variables
-import json             # JSON serialization and deserialization
+import logging          # Leveled console output for policy diagnostics
+import time             # Timestamps for the discovery circuit breaker
 import requests         # HTTP requests for registry discovery
+from requests.adapters import HTTPAdapter  # Connection pooling for the shared session
+import urllib3          # Errors raised while ijson reads the raw response stream
+import httpx            # Async HTTP client for non-blocking discovery
+import orjson           # Fast JSON serialization and deserialization
+import ijson            # Incremental JSON parsing for large registry responses
 from datetime import datetime, timedelta  # Date calculations for cache expiry
+from urllib.parse import urlencode        # Percent-encoded discovery query strings
+import copy                               # Hand out private copies of memoized JSON
 from dotenv import load_dotenv            # Load environment variables from .env
 
 # Load environment variables into os.environ
 load_dotenv()
 
+# Module logger; console formatting is configured by the entrypoint
+logger = logging.getLogger(__name__)
+
+
+def log_banner(log: logging.Logger, *lines: str, level: int = logging.INFO):
+    """
+    Emit a block of banner lines at the given level.
+    Nothing is emitted when that level is disabled.
+
+    :param log: Logger to write to.
+    :param lines: Pre-built banner lines.
+    :param level: Logging level for the whole block.
+    """
+    if not log.isEnabledFor(level):
+        return
+    for line in lines:
+        log.log(level, line)
+
+
+# Parsed JSON files: absolute path -> ((st_mtime_ns, st_size), data)
+_JSON_MEMO: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
+class _AsyncByteReader:
+    """
+    Minimal async file-like wrapper over an async byte iterator, so ijson
+    can parse an httpx response stream incrementally. Honours `size`,
+    keeping the unread tail of a chunk for the next call; ijson probes
+    the stream with read(0), which must not consume data.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = b""
+        self._eof = False
+
+    async def _next_chunk(self) -> bytes:
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            return b""
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""
+        if size < 0:
+            parts = [self._buffer]
+            self._buffer = b""
+            while not self._eof:
+                parts.append(await self._next_chunk())
+            return b"".join(parts)
+        while not self._buffer and not self._eof:
+            self._buffer = await self._next_chunk()
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
 
 class PolicyManager:
     """
@@ -20,37 +85,125 @@ class PolicyManager:
     # Local cache filename for verified MCP servers
     CACHE_FILE = "cached_mcp_servers.json"
 
-    def __init__(self, policy_path: str = "policy.json"):
+    # Pre-ISO 'last_cached' format, recognized only to migrate old cache files
+    LEGACY_CACHE_TIME_FORMAT = "%d.%m.%Y %H:%M:%S"
+
+    # Registry HTTP timeouts in seconds: (connect, read)
+    HTTP_TIMEOUT = (3.05, 5)
+
+    # After a failed discovery, skip live discovery for this many seconds
+    DISCOVERY_COOLDOWN = 30
+    # Time of the last failed discovery, persisted so the cooldown spans runs
+    DISCOVERY_STATE_FILE = "discovery_state.json"
+
+    # Registry responses larger than this (bytes) are streamed through ijson
+    STREAM_PARSE_THRESHOLD = 1 << 20
+
+    # Default discovery filters sent to the NANDA registry
+    DEFAULT_CRITERIA = {
+        "limit": 3,
+        "q": "recipe",
+        "tags": "nutrition",
+        "type": "tool",
+        "verified": "true"
+    }
+
+    def __init__(self, policy_path: str = "policy.json", discover: bool = True):
         """
         Initialize PolicyManager:
         1) Load policies from JSON file
         2) Display protocol directory & guidelines
         3) Perform live discovery against NANDA Registry
-        4) Display raw protocol response
+        4) Display raw protocol response (DEBUG only; no extra fetch)
+
+        :param policy_path: Path to policy JSON.
+        :param discover: Run blocking discovery now. Pass False when the caller
+                         will use aget_verifiable_mcp_endpoint from an event loop.
         """
         # Path to policy JSON
         self.policy_path = policy_path
         # Load policy definitions into dict
         self.policies = self._load_json(policy_path)
+        # Discovery criteria used for this manager's lookups
+        self._criteria = dict(self.DEFAULT_CRITERIA)
+        # Discovery URL built once from the endpoint and criteria
+        self._discovery_url = self.build_url(self.policies['registry_discovery_end_point'], self._criteria)
+        # Raw registry response text, populated by _discover_registry
+        self._raw_response = ""
+        # Shared HTTP session so registry calls reuse pooled keep-alive connections
+        self._http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        # Async HTTP client, created lazily by the async discovery path
+        self._ahttp: httpx.AsyncClient | None = None
+
+        # Discovery results; filled by _discover_registry or _adiscover_registry
+        self.registry_response_data = {}
+        self.policy_metrics = self.policies['qualifiers_metrics']
+        self._discovered = False
+        # Qualifier thresholds flattened once: (verified, providers, min relevance, min uptime)
+        vp = {m['name']: m for m in self.policy_metrics}
+        self._policy_tuple = (
+            vp['verified']['value'],
+            frozenset(vp['provider']['value']),
+            vp['relevance_score']['value'],
+            vp['uptime']['value'],
+        )
 
         # 1) Show protocol directory & policy guidelines
         self._show_protocol_directory()
 
-        # 2) Do a live discovery against registry
-        self.registry_response_data, self.policy_metrics = self._discover_registry()
+        if discover:
+            self._ensure_discovered()
 
-        # 3) Print the raw protocol response
-        self._show_protocol_response()
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Close the shared HTTP session and release pooled connections.
+        """
+        http = getattr(self, "_http", None)
+        if http is not None:
+            http.close()
+            self._http = None
+
+    async def aclose(self):
+        """
+        Close both the async HTTP client and the shared sync session.
+        """
+        if self._ahttp is not None:
+            await self._ahttp.aclose()
+            self._ahttp = None
+        self.close()
 
     def _load_json(self, path: str) -> dict:
         """
         Helper to load and parse a JSON file.
+        The parsed result is memoized per path and reused while the file's
+        mtime and size are unchanged, so repeat loads cost one os.stat plus a
+        deep copy instead of an open, read and parse. Callers get their own
+        copy and may mutate it freely.
 
         :param path: Path to JSON file.
         :return: Parsed JSON as dict.
         """
-        with open(path, 'r') as f:
-            return json.load(f)
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        hit = _JSON_MEMO.get(path)
+        if hit is None or hit[0] != stamp:
+            with open(path, 'rb') as f:
+                hit = _JSON_MEMO[path] = (stamp, orjson.loads(f.read()))
+        # Callers mutate what they load; never hand out the memoized object
+        return copy.deepcopy(hit[1])
 
     def _save_json(self, path: str, data: dict):
         """
@@ -59,22 +212,10 @@ class PolicyManager:
         :param path: Path to output JSON file.
         :param data: Dictionary to serialize.
         """
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=4)
-
-    def get_url_response(self, url: str) -> str:
-        """
-        Perform HTTP GET and return text or error string.
-
-        :param url: URL to fetch.
-        :return: Response text or error message.
-        """
-        try:
-            r = requests.get(url)
-            r.raise_for_status()
-            return r.text
-        except requests.exceptions.RequestException as e:
-            return f"Error fetching the URL: {e}"
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        # Writes within the filesystem's mtime granularity would look unchanged
+        _JSON_MEMO.pop(os.path.abspath(path), None)
 
     def build_url(self, base: str, criteria: dict) -> str:
         """
@@ -84,9 +225,8 @@ class PolicyManager:
         :param criteria: Dictionary of query parameters.
         :return: Full URL string.
         """
-        # Ensure single '?' and join criteria with '&'
-        url = base.rstrip("?") + "?" + "&".join(f"{k}={v}" for k, v in criteria.items())
-        return url
+        # Ensure single '?' and percent-encode criteria
+        return f"{base.rstrip('?')}?{urlencode(criteria)}"
 
     def _discover_registry(self):
         """
@@ -94,80 +234,223 @@ class PolicyManager:
 
         :return: Tuple of (registry response dict, policy metrics list).
         """
-        # Default discovery filters
-        criteria = {
-            "limit": 3,
-            "q": "recipe",
-            "tags": "nutrition",
-            "type": "tool",
-            "verified": "true"
-        }
-        # Build URL and fetch response
-        mcp_server_link = self.build_url(self.policies['registry_discovery_end_point'], criteria)
-        response = self.get_url_response(mcp_server_link)
+        # Fetch the precomputed URL once; keep raw text for display
         try:
-            data = json.loads(response)
-        except json.JSONDecodeError:
-            data = {}
+            with self._http.get(self._discovery_url, stream=True, timeout=self.HTTP_TIMEOUT) as r:
+                r.raise_for_status()
+                if self._is_large_response(r.headers):
+                    # Parse incrementally and stop at the first policy match
+                    r.raw.decode_content = True
+                    items = ijson.items(r.raw, "data.item", use_float=True)
+                    item = next(filter(self._item_passes_policy, items), None)
+                    return self._streamed_result(item), self.policies['qualifiers_metrics']
+                response = r.text
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+            # urllib3 errors escape requests' wrapping when ijson reads r.raw
+            return self._fetch_failed(e), self.policies['qualifiers_metrics']
+        except ijson.JSONError as e:
+            return self._fetch_failed(e, registry_down=False), self.policies['qualifiers_metrics']
+        self._raw_response = response
         # Return raw data and qualifiers metrics for policy matching
-        return data, self.policies['qualifiers_metrics']
+        return self._parse_registry_response(response), self.policies['qualifiers_metrics']
+
+    async def _adiscover_registry(self):
+        """
+        Async counterpart of _discover_registry; does not block the event loop.
+
+        :return: Tuple of (registry response dict, policy metrics list).
+        """
+        if self._ahttp is None:
+            connect, read = self.HTTP_TIMEOUT
+            self._ahttp = httpx.AsyncClient(
+                http2=True,
+                follow_redirects=True,
+                timeout=httpx.Timeout(read, connect=connect),
+            )
+        try:
+            async with self._ahttp.stream("GET", self._discovery_url) as r:
+                r.raise_for_status()
+                if self._is_large_response(r.headers):
+                    # Parse incrementally and stop at the first policy match
+                    item = None
+                    reader = _AsyncByteReader(r.aiter_bytes())
+                    async for candidate in ijson.items(reader, "data.item", use_float=True):
+                        if self._item_passes_policy(candidate):
+                            item = candidate
+                            break
+                    return self._streamed_result(item), self.policies['qualifiers_metrics']
+                await r.aread()
+                response = r.text
+        except httpx.HTTPError as e:
+            return self._fetch_failed(e), self.policies['qualifiers_metrics']
+        except ijson.JSONError as e:
+            return self._fetch_failed(e, registry_down=False), self.policies['qualifiers_metrics']
+        self._raw_response = response
+        return self._parse_registry_response(response), self.policies['qualifiers_metrics']
+
+    def _is_large_response(self, headers) -> bool:
+        """
+        Decide whether a registry response should be streamed through ijson.
+
+        :param headers: Response headers.
+        :return: True if Content-Length exceeds STREAM_PARSE_THRESHOLD.
+        """
+        try:
+            return int(headers.get("Content-Length", 0)) > self.STREAM_PARSE_THRESHOLD
+        except ValueError:
+            return False
+
+    def _streamed_result(self, item: dict | None) -> dict:
+        """
+        Wrap the first streamed policy match as registry data.
+        The full payload is never materialized, so only a note is kept for display.
+
+        :param item: First item passing policy, or None.
+        :return: Registry data dict with at most one item.
+        """
+        self._raw_response = "<large registry response streamed; only the first policy match was kept>"
+        return {"data": [item] if item else []}
+
+    def _parse_registry_response(self, response: str) -> dict:
+        """
+        Parse registry response text, returning an empty dict on bad JSON.
+
+        :param response: Raw response text.
+        :return: Parsed registry data.
+        """
+        try:
+            return orjson.loads(response)
+        except orjson.JSONDecodeError:
+            self._record_failure()
+            return {}
+
+    def _fetch_failed(self, error: Exception, registry_down: bool = True) -> dict:
+        """
+        Handle a failed registry fetch and keep its message for display.
+
+        :param error: Exception raised while fetching or streaming.
+        :param registry_down: Open the persisted circuit breaker. Pass False for
+                              local parse errors, which say nothing about
+                              registry availability.
+        :return: Empty registry data.
+        """
+        self._raw_response = f"Error fetching the URL: {error}"
+        if registry_down:
+            self._record_failure()
+        return {}
+
+    def _record_failure(self):
+        """
+        Open the discovery circuit breaker for DISCOVERY_COOLDOWN seconds.
+        The time is written to DISCOVERY_STATE_FILE so the next run sees it too.
+        """
+        try:
+            self._save_json(self.DISCOVERY_STATE_FILE, {"last_failure": time.time()})
+        except OSError as e:
+            logger.debug("Could not persist discovery failure time: %s", e)
+
+    def _last_failure_ts(self) -> float:
+        """
+        Read the persisted time of the last failed discovery.
+
+        :return: Epoch seconds, or 0.0 if none is recorded.
+        """
+        if not os.path.exists(self.DISCOVERY_STATE_FILE):
+            return 0.0
+        try:
+            return float(self._load_json(self.DISCOVERY_STATE_FILE).get("last_failure", 0.0))
+        except (OSError, orjson.JSONDecodeError, AttributeError, TypeError, ValueError):
+            return 0.0
+
+    def _discovery_on_cooldown(self) -> bool:
+        """
+        Check whether live discovery should be skipped after a recent failure.
+        Marks discovery done with no live data so resolution uses the cache.
+
+        :return: True if discovery is skipped.
+        """
+        if time.time() - self._last_failure_ts() >= self.DISCOVERY_COOLDOWN:
+            return False
+        logger.debug("Skipping live discovery; last failure was under %ss ago", self.DISCOVERY_COOLDOWN)
+        self.registry_response_data = {}
+        self._discovered = True
+        return True
+
+    def _ensure_discovered(self):
+        """
+        Run blocking discovery once and display the raw response.
+        """
+        if self._discovered or self._discovery_on_cooldown():
+            return
+        self.registry_response_data, self.policy_metrics = self._discover_registry()
+        self._discovered = True
+        self._show_protocol_response()
+
+    async def _aensure_discovered(self):
+        """
+        Run non-blocking discovery once and display the raw response.
+        """
+        if self._discovered or self._discovery_on_cooldown():
+            return
+        self.registry_response_data, self.policy_metrics = await self._adiscover_registry()
+        self._discovered = True
+        self._show_protocol_response()
 
     def _show_protocol_directory(self):
         """
-        Print the protocol directory and policy guidelines to console.
-        Preserves original formatting and print statements.
+        Log the protocol directory and policy guidelines at INFO.
+        Preserves the original console layout.
         """
         p = self.policies
-        print(" ")
-        print("  This Example is only for demonstration purpose")
-        print("  This chat is controlled by AXONVERTEX AI Policy Control Group ")
-        print("")
-        print("  ====================PROTOCOL DIRECTORY ==========================")
-        print("  ----------------------------------------------------------")
-        print("  Protocol Cluster:", p['protocol_cluster'])
-        print("  ----------------------------------------------------------")
-        print("  Protocol Level:", p['protocol_level'])
-        print("  ----------------------------------------------------------")
-        print("  Policy Cluster:", p['policy_cluster'])
-        print("  ----------------------------------------------------------")
-        print("  MCP Registry URL:", p['mcp_registry'])
-        print("  ----------------------------------------------------------")
-        print("  Registry Discovery Endpoint:", p['registry_discovery_end_point'])
-        print("  ----------------------------------------------------------")        
-        print("  Policy for caching MCP Servers once verified :", p['cache_mcp_servers_policy'])
-        print("  ----------------------------------------------------------")
-        print("  Policy Tags for AXONVERTEX :", ", ".join(p['policy_tags']))
-        print("  ----------------------------------------------------------")
-        print("  ====================PROTOCOL DIRECTORY ==========================")
-        print("")
-        print("  ====================PROTOCOL POLICY GUIDELINES ==========================")
+        logger.info(" ")
+        logger.info("  This Example is only for demonstration purpose")
+        logger.info("  This chat is controlled by AXONVERTEX AI Policy Control Group ")
+        logger.info("")
+        logger.info("  ====================PROTOCOL DIRECTORY ==========================")
+        logger.info("  ----------------------------------------------------------")
+        logger.info("  Protocol Cluster: %s", p['protocol_cluster'])
+        logger.info("  ----------------------------------------------------------")
+        logger.info("  Protocol Level: %s", p['protocol_level'])
+        logger.info("  ----------------------------------------------------------")
+        logger.info("  Policy Cluster: %s", p['policy_cluster'])
+        logger.info("  ----------------------------------------------------------")
+        logger.info("  MCP Registry URL: %s", p['mcp_registry'])
+        logger.info("  ----------------------------------------------------------")
+        logger.info("  Registry Discovery Endpoint: %s", p['registry_discovery_end_point'])
+        logger.info("  ----------------------------------------------------------")        
+        logger.info("  Policy for caching MCP Servers once verified : %s", p['cache_mcp_servers_policy'])
+        logger.info("  ----------------------------------------------------------")
+        logger.info("  Policy Tags for AXONVERTEX : %s", ", ".join(p['policy_tags']))
+        logger.info("  ----------------------------------------------------------")
+        logger.info("  ====================PROTOCOL DIRECTORY ==========================")
+        logger.info("")
+        logger.info("  ====================PROTOCOL POLICY GUIDELINES ==========================")
         for metric in p['qualifiers_metrics']:
-            print(f"  Policy Enforced on Attribute Name : {metric['name']}, "
-                  f"Attribute Acceptable Value: {metric['value']}, "
-                  f"Attribute Need : {metric['need']}")
-            print("  ------------------------------------------------------------------------------------------------------------------------")
-        print("  ====================PROTOCOL POLICY GUIDELINES ==========================")
-        print("")
+            logger.info("  Policy Enforced on Attribute Name : %s, "
+                        "Attribute Acceptable Value: %s, "
+                        "Attribute Need : %s",
+                        metric['name'], metric['value'], metric['need'])
+            logger.info("  ------------------------------------------------------------------------------------------------------------------------")
+        logger.info("  ====================PROTOCOL POLICY GUIDELINES ==========================")
+        logger.info("")
 
     def _show_protocol_response(self):
         """
-        Print the raw protocol response retrieved from the registry.
+        Log the raw protocol response retrieved from the registry at DEBUG.
+        Reuses the response cached by _discover_registry and never fetches;
+        returns before any formatting when DEBUG is disabled.
         """
-        # Reuse default criteria for display consistency
-        criteria = {
-            "limit": 3,
-            "q": "recipe",
-            "tags": "nutrition",
-            "type": "tool",
-            "verified": "true"
-        }
-        url = self.build_url(self.policies['registry_discovery_end_point'], criteria)
-        raw = self.get_url_response(url)
-        print("  ==================== PROTOCOL RESPONSE START ==========================")
-        print("")
-        print("Response from URL:", raw)
-        print("")
-        print("  ==================== PROTOCOL RESPONSE END ==========================")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        log_banner(logger,
+                   "  ==================== PROTOCOL RESPONSE START ==========================",
+                   "",
+                   level=logging.DEBUG)
+        logger.debug("Response from URL: %s", self._raw_response)
+        log_banner(logger,
+                   "",
+                   "  ==================== PROTOCOL RESPONSE END ==========================",
+                   level=logging.DEBUG)
 
     def match_policy_and_get_url(self) -> dict | None:
         """
@@ -175,46 +458,84 @@ class PolicyManager:
 
         :return: Valid MCP server item dict or None.
         """
-        # Create lookup for policy values by name
-        vp = {m['name']: m for m in self.policy_metrics}
-        # Iterate over discovered items
-        for item in self.registry_response_data.get('data', []):
-            if (
-                item['verified'] == vp['verified']['value'] and
-                item['provider'] in vp['provider']['value'] and
-                item['relevance_score'] >= vp['relevance_score']['value'] and
-                item['uptime'] >= vp['uptime']['value']
-            ):
-                return item
-        return None
+        return next(filter(self._item_passes_policy, self.registry_response_data.get('data', [])), None)
 
     def _item_passes_policy(self, item: dict) -> bool:
         """
-        Check if a cached item still meets policy qualifiers.
+        Check if a discovered or cached item meets policy qualifiers.
 
         :param item: MCP server metadata item.
         :return: True if all mandatory qualifiers are met.
         """
-        vp = {m['name']: m for m in self.policy_metrics}
+        v, ps, mr, mu = self._policy_tuple
         return (
-            item['verified'] == vp['verified']['value'] and
-            item['provider'] in vp['provider']['value'] and
-            item['relevance_score'] >= vp['relevance_score']['value'] and
-            item['uptime'] >= vp['uptime']['value']
+            item['verified'] == v and
+            item['provider'] in ps and
+            item['relevance_score'] >= mr and
+            item['uptime'] >= mu
         )
 
     def load_cache(self) -> dict:
         """
         Load the local cache JSON or return empty structure if missing/corrupt.
+        Older list-based or DMY-timestamped cache files are migrated and saved.
 
-        :return: Cache dict with 'cached_mcp' list.
+        :return: Cache dict with 'cached_mcp_by_id' mapping item ID to entry.
         """
         if not os.path.exists(self.CACHE_FILE):
-            return {"cached_mcp": []}
+            return {"cached_mcp_by_id": {}}
         try:
-            return self._load_json(self.CACHE_FILE)
-        except json.JSONDecodeError:
-            return {"cached_mcp": []}
+            cache = self._load_json(self.CACHE_FILE)
+        except orjson.JSONDecodeError:
+            return {"cached_mcp_by_id": {}}
+        changed = self._index_legacy_cache(cache)
+        changed = self._migrate_cache_timestamps(cache) or changed
+        if changed:
+            self.save_cache(cache)
+        return cache
+
+    def _index_legacy_cache(self, cache: dict) -> bool:
+        """
+        Convert a legacy 'cached_mcp' list into the 'cached_mcp_by_id' dict in place.
+        The first entry for an ID wins, matching the old lookup order.
+        Entries with neither an item ID nor an endpoint string are dropped.
+
+        :param cache: Cache dict as loaded from disk.
+        :return: True if the cache was converted.
+        """
+        by_id = cache.setdefault("cached_mcp_by_id", {})
+        if "cached_mcp" not in cache:
+            return False
+        for e in cache.pop("cached_mcp") or []:
+            if not isinstance(e, dict):
+                continue
+            key = (e.get("data_item") or {}).get("id") or e.get("mcp_endpoint")
+            if isinstance(key, str) and key:
+                by_id.setdefault(key, e)
+        return True
+
+    def _migrate_cache_timestamps(self, cache: dict) -> bool:
+        """
+        Rewrite legacy DMY 'last_cached' values to ISO-8601 in place.
+
+        :param cache: Cache dict as loaded from disk.
+        :return: True if any entry was rewritten.
+        """
+        changed = False
+        for e in cache.get("cached_mcp_by_id", {}).values():
+            value = e.get("last_cached")
+            if not value:
+                continue
+            try:
+                datetime.fromisoformat(value)
+            except ValueError:
+                try:
+                    legacy = datetime.strptime(value, self.LEGACY_CACHE_TIME_FORMAT)
+                except ValueError:
+                    continue
+                e["last_cached"] = legacy.isoformat(timespec="seconds")
+                changed = True
+        return changed
 
     def save_cache(self, cache: dict):
         """
@@ -236,32 +557,28 @@ class PolicyManager:
         cutoff = now - timedelta(hours=72)
 
         # Check existing entry by item ID
-        existing = next(
-            (e for e in cache.get("cached_mcp", [])
-             if e.get("data_item", {}).get("id") == item["id"]),
-            None
-        )
+        entries = cache.setdefault("cached_mcp_by_id", {})
+        existing = entries.get(item["id"])
         # If exists and still fresh, do nothing
         if existing:
-            last = datetime.strptime(existing['last_cached'], "%d.%m.%Y %H:%M:%S")
-            if last > cutoff:
+            try:
+                last = datetime.fromisoformat(existing['last_cached'])
+            except (KeyError, ValueError):
+                last = None
+            if last and last > cutoff:
                 return
 
         # Build new entry
         entry = {
             "mcp_endpoint": endpoint,
             "met_protocol_criteria": True,
-            "last_cached": now.strftime("%d.%m.%Y %H:%M:%S"),
+            "last_cached": now.isoformat(timespec="seconds"),
             "criteria": criteria,
             "data_item": item
         }
 
-        # Replace existing or append new
-        if existing:
-            idx = cache["cached_mcp"].index(existing)
-            cache["cached_mcp"][idx] = entry
-        else:
-            cache.setdefault("cached_mcp", []).append(entry)
+        # Replace existing in place or append new
+        entries[item["id"]] = entry
 
         # Save updated cache
         self.save_cache(cache)
@@ -273,12 +590,30 @@ class PolicyManager:
         :return: Endpoint URL or None.
         """
         cache = self.load_cache()
-        for e in cache.get("cached_mcp", []):
+        for e in cache.get("cached_mcp_by_id", {}).values():
             if e.get("met_protocol_criteria"):
                 return e["mcp_endpoint"]
         return None
 
     def get_verifiable_mcp_endpoint(self) -> str | None:
+        """
+        Blocking endpoint resolution for CLI use; discovers via requests if needed.
+
+        :return: Verified MCP endpoint URL or None.
+        """
+        self._ensure_discovered()
+        return self._resolve_endpoint()
+
+    async def aget_verifiable_mcp_endpoint(self) -> str | None:
+        """
+        Non-blocking endpoint resolution for use inside the asyncio event loop.
+
+        :return: Verified MCP endpoint URL or None.
+        """
+        await self._aensure_discovered()
+        return self._resolve_endpoint()
+
+    def _resolve_endpoint(self) -> str | None:
         """
         Orchestrate endpoint resolution:
         1) Live discovery and policy matching
@@ -287,13 +622,7 @@ class PolicyManager:
 
         :return: Verified MCP endpoint URL or None.
         """
-        criteria = {
-            "limit": 3,
-            "q": "recipe",
-            "tags": "nutrition",
-            "type": "tool",
-            "verified": "true"
-        }
+        criteria = self._criteria
 
         # 1) live discovery
         live_item = self.match_policy_and_get_url()
@@ -305,13 +634,12 @@ class PolicyManager:
                 "relevance_score": live_item["relevance_score"],
                 "uptime": live_item["uptime"]
             }
-            print("")
-            print("  ---------------REGISTERED MCP SERVER INFORMATION FOR NUTRITION AND RECIPES-------------------")
-            print("")
-            print(" ", mcp_info)
-            print("")
-            print("  ---------------END-------------------")
-            print("")
+            log_banner(logger,
+                       "",
+                       "  ---------------REGISTERED MCP SERVER INFORMATION FOR NUTRITION AND RECIPES-------------------",
+                       "")
+            logger.info("  %s", mcp_info)
+            log_banner(logger, "", "  ---------------END-------------------", "")
 
             # Update cache if enabled
             if self.policies.get("cache_mcp_servers_policy"):
@@ -320,23 +648,22 @@ class PolicyManager:
             return live_item['url']
 
         # 2) fallback to cache
-        print("\n  WARNING !!!!!!! Live discovery failed; attempting policy check on cached entry…")
+        logger.warning("\n  WARNING !!!!!!! Live discovery failed; attempting policy check on cached entry…")
         cache = self.load_cache()
-        for entry in cache.get("cached_mcp", []):
+        for entry in cache.get("cached_mcp_by_id", {}).values():
             item = entry.get("data_item")
             if item and self._item_passes_policy(item):
-                print("")
-                print("  ---------------USING CACHED MCP SERVER INFORMATION-------------------")
-                print("")
-                print(" ", {
+                log_banner(logger,
+                           "",
+                           "  ---------------USING CACHED MCP SERVER INFORMATION-------------------",
+                           "")
+                logger.info("  %s", {
                     "name": item["name"],
                     "endpoint_url": entry["mcp_endpoint"],
                     "relevance_score": item["relevance_score"],
                     "uptime": item["uptime"]
                 })
-                print("")
-                print("  ---------------END-------------------")
-                print("")
+                log_banner(logger, "", "  ---------------END-------------------", "")
                 return entry["mcp_endpoint"]
 
         # 3) nothing left
@@ -0,0 +1,71 @@
+"""
+Regression tests for nandaPolicy helpers.
+"""
+
+import asyncio
+
+import ijson
+import orjson
+
+from nandaPolicy import _AsyncByteReader
+
+
+async def _chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+def test_async_byte_reader_feeds_ijson_across_chunks():
+    doc = orjson.dumps({"data": [{"id": str(i), "uptime": i} for i in range(5000)]})
+
+    async def collect():
+        reader = _AsyncByteReader(_chunked(doc, 4096))
+        return [item async for item in ijson.items(reader, "data.item", use_float=True)]
+
+    items = asyncio.run(collect())
+    assert len(items) == 5000
+    assert items[0] == {"id": "0", "uptime": 0}
+    assert items[-1] == {"id": "4999", "uptime": 4999}
+
+
+def test_async_byte_reader_honours_size():
+    async def reads():
+        reader = _AsyncByteReader(_chunked(b"abcdefghij", 4))
+        return [await reader.read(0), await reader.read(3), await reader.read(3),
+                await reader.read(-1), await reader.read(5)]
+
+    assert asyncio.run(reads()) == [b"", b"abc", b"d", b"efghij", b""]
+
+
+def test_index_legacy_cache_drops_keyless_entries():
+    from nandaPolicy import PolicyManager
+
+    pm = PolicyManager.__new__(PolicyManager)
+    cache = {"cached_mcp": [
+        {"data_item": None},
+        {"data_item": {"id": None}, "mcp_endpoint": None},
+        {"data_item": {"id": "a"}, "mcp_endpoint": "https://a/"},
+        {"data_item": {"id": "a"}, "mcp_endpoint": "https://dup/"},
+        {"data_item": None, "mcp_endpoint": "https://b/"},
+    ]}
+
+    assert pm._index_legacy_cache(cache)
+    assert list(cache["cached_mcp_by_id"]) == ["a", "https://b/"]
+    assert cache["cached_mcp_by_id"]["a"]["mcp_endpoint"] == "https://a/"
+    orjson.dumps(cache)
+
+
+def test_load_json_memo_returns_private_copies(tmp_path):
+    from nandaPolicy import PolicyManager
+
+    pm = PolicyManager.__new__(PolicyManager)
+    path = tmp_path / "cache.json"
+    pm._save_json(str(path), {"cached_mcp_by_id": {}})
+
+    first = pm._load_json(str(path))
+    first["junk"] = 1
+    first["cached_mcp_by_id"]["x"] = {}
+    assert pm._load_json(str(path)) == {"cached_mcp_by_id": {}}
+
+    pm._save_json(str(path), {"cached_mcp_by_id": {"y": {}}})
+    assert pm._load_json(str(path)) == {"cached_mcp_by_id": {"y": {}}}